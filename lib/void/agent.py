@@ -21,12 +21,18 @@
 # FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
 # OTHER DEALINGS IN THE SOFTWARE.
 
-import math
+import itertools, math
 from pyglet.gl import *
+import void.box2d as box2d
+
+# Creation order, for iterating agents independently of memory addresses.
+# Serials start at one so that zero can stand for no agent.
+serials = itertools.count(1)
 
 class Agent(object):
     def __init__(self, world):
         self.world = world
+        self.serial = serials.next()
         self.alive = True
         self.__power = 1.0
 
@@ -40,21 +46,37 @@ class Agent(object):
 
     power = property(__get_power, __set_power)
 
-    def draw(self):
+    def get_state(self):
+        position = self.body.GetPosition()
+        linear_velocity = self.body.GetLinearVelocity()
+        return {
+            "position": (position.x, position.y),
+            "angle": self.body.GetAngle(),
+            "linear_velocity": (linear_velocity.x, linear_velocity.y),
+            "angular_velocity": self.body.GetAngularVelocity(),
+            "power": self.power,
+        }
+
+    def set_state(self, state):
+        position = box2d.b2Vec2(*state["position"])
+        self.body.SetXForm(position, state["angle"])
+        self.body.SetLinearVelocity(box2d.b2Vec2(*state["linear_velocity"]))
+        self.body.SetAngularVelocity(state["angular_velocity"])
+        self.power = state["power"]
+
+    def draw(self, scale):
         position = self.body.GetPosition()
         angle = self.body.GetAngle()
         glPushMatrix()
         glTranslated(position.x, position.y, 0.0)
         glRotated(angle * 180.0 / math.pi, 0.0, 0.0, 1.0)
-        self.draw_geometry()
+        self.draw_geometry(scale)
         glPopMatrix()
 
-    def draw_geometry(self):
-        shape = self.body.GetShapeList()
-        polygon = shape.asPolygon()
+    def draw_geometry(self, scale):
         glBegin(GL_POLYGON)
         glColor3d(*self.color)
-        for x, y in polygon.getCoreVertices_tuple():
+        for x, y in self.vertices:
             glVertex2d(x, y)
         glEnd()
         
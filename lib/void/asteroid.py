@@ -27,7 +27,7 @@ import void.box2d as box2d
 
 class Asteroid(Agent):
     def __init__(self, world, ship=None, radius=None, position=None,
-                 linear_velocity=None):
+                 linear_velocity=None, vertices=None):
         super(Asteroid, self).__init__(world)
         if radius is None:
             radius = 3.0 * (1.0 + random.random())
@@ -45,34 +45,35 @@ class Asteroid(Agent):
         self.radius = radius
         self.color = (0.5 * random.random(), 0.5 * random.random(),
                       0.5 * random.random() + 0.5)
-        self.body = self.create_body(position, linear_velocity)
+        self.body = self.create_body(position, linear_velocity, vertices)
 
-    def create_body(self, position, linear_velocity):
-        body_def = box2d.b2BodyDef()
-        body_def.position = position
-        body_def.angle = 2.0 * math.pi * random.random()
-
-        shape_def = box2d.b2PolygonDef()
-        vertices = []
-        for i in xrange(5):
-            angle = (i + random.random()) / 5.0 * 2.0 * math.pi
-            x = self.radius * math.cos(angle)
-            y = self.radius * math.sin(angle)
-            vertices.append((x, y))
-        shape_def.setVertices_tuple(vertices)
-        shape_def.density = 2000.0
-        shape_def.restitution = 1.0
-        shape_def.filter.categoryBits = 0x0002
-        shape_def.filter.maskBits = 0x0001
-
-        body = self.world.CreateBody(body_def)
-        body.CreateShape(shape_def)
-        body.SetMassFromShapes()
+    def create_body(self, position, linear_velocity, vertices=None):
+        angle = 2.0 * math.pi * random.random()
+        if vertices is None:
+            vertices = []
+            for i in xrange(5):
+                vertex_angle = (i + random.random()) / 5.0 * 2.0 * math.pi
+                x = self.radius * math.cos(vertex_angle)
+                y = self.radius * math.sin(vertex_angle)
+                vertices.append((x, y))
+        self.vertices = vertices
+        body = self.world.create_polygon_body(self, position, angle, vertices,
+                                              2000.0, 1.0, 0x0002, 0x0001)
         body.SetLinearVelocity(linear_velocity)
         body.SetAngularVelocity(random.random() - 0.5)
-        body.SetUserData(self)
         return body
 
+    def get_state(self):
+        state = super(Asteroid, self).get_state()
+        state["radius"] = self.radius
+        state["color"] = self.color
+        state["vertices"] = list(self.vertices)
+        return state
+
+    def set_state(self, state):
+        super(Asteroid, self).set_state(state)
+        self.color = state["color"]
+
     def split(self):
         if self.radius < 1.0:
             return []
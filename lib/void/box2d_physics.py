@@ -0,0 +1,126 @@
+# Copyright (c) 2008 Mikael Lind
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+import void.box2d as box2d
+from void.physics import Physics
+from void.void_contact_listener import VoidContactListener
+
+# Box2D allocates one broadphase proxy per shape from a fixed pool and
+# asserts in C++ when it runs out. The pool size is a compile-time setting;
+# 512 is the Box2D 2.0 default for builds that do not expose it.
+max_proxies = getattr(box2d, "b2_maxProxies", 512)
+
+class Box2DPhysics(Physics):
+    def __init__(self, listener):
+        super(Box2DPhysics, self).__init__(listener)
+        self.world = self.create_world()
+        self.contact_listener = VoidContactListener(listener)
+        self.world.SetContactListener(self.contact_listener)
+
+    def create_world(self):
+        world_aabb = box2d.b2AABB()
+        world_aabb.lowerBound.Set(-400.0, -400.0)
+        world_aabb.upperBound.Set(400.0, 400.0)
+        gravity = box2d.b2Vec2(0.0, 0.0)
+        return box2d.b2World(world_aabb, gravity, False)
+
+    def create_polygon_body(self, agent, position, angle, vertices, density,
+                            restitution, category_bits, mask_bits):
+        body_def = box2d.b2BodyDef()
+        body_def.position = position
+        body_def.angle = angle
+
+        shape_def = box2d.b2PolygonDef()
+        shape_def.setVertices_tuple(vertices)
+        shape_def.density = density
+        shape_def.restitution = restitution
+        shape_def.filter.categoryBits = category_bits
+        shape_def.filter.maskBits = mask_bits
+        return self.create_body(agent, body_def, shape_def)
+
+    def create_circle_body(self, agent, position, radius, category_bits,
+                           mask_bits, sensor=False):
+        body_def = box2d.b2BodyDef()
+        body_def.position = position
+
+        shape_def = box2d.b2CircleDef()
+        shape_def.radius = radius
+        shape_def.filter.categoryBits = category_bits
+        shape_def.filter.maskBits = mask_bits
+        shape_def.isSensor = sensor
+        return self.create_body(agent, body_def, shape_def)
+
+    def create_body(self, agent, body_def, shape_def):
+        body = self.world.CreateBody(body_def)
+        body.CreateShape(shape_def)
+        body.SetMassFromShapes()
+        body.SetUserData(agent)
+        return body
+
+    def destroy_body(self, body):
+        self.world.DestroyBody(body)
+
+    def get_agents(self):
+        agents = []
+        body = self.world.GetBodyList()
+        while body is not None:
+            agent = body.GetUserData()
+            if agent is not None:
+                agents.append(agent)
+            body = body.GetNext()
+
+        # Box2D prepends new bodies, so reverse to get creation order.
+        agents.reverse()
+        return agents
+
+    def step(self, dt):
+        self.world.Step(dt, 10, 8)
+
+    def query(self, lower_bound, upper_bound, max_count):
+        aabb = box2d.b2AABB()
+        aabb.lowerBound.Set(lower_bound.x, lower_bound.y)
+        aabb.upperBound.Set(upper_bound.x, upper_bound.y)
+        (count, shapes) = self.world.Query(aabb, max_count)
+        return list(set(shape.GetBody().GetUserData() for shape in shapes))
+
+    def raycast(self, point_1, point_2):
+        segment = box2d.b2Segment()
+        segment.p1 = point_1
+        segment.p2 = point_2
+        fraction, normal, shape = self.world.RaycastOne(segment, False, None)
+        if shape is None:
+            return fraction, None
+        return fraction, shape.GetBody().GetUserData()
+
+    def create_distance_joint(self, body_1, body_2):
+        joint_def = box2d.b2DistanceJointDef()
+        joint_def.Initialize(body_1, body_2, body_1.GetPosition(),
+                             body_2.GetPosition())
+        joint_def.collideConnected = True
+        return self.world.CreateJoint(joint_def)
+
+    def destroy_joint(self, joint):
+        self.world.DestroyJoint(joint)
+
+    def get_joint_anchors(self, joint):
+        return joint.GetAnchor1(), joint.GetAnchor2()
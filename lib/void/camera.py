@@ -0,0 +1,52 @@
+# Copyright (c) 2008 Mikael Lind
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+class Camera(object):
+    def __init__(self):
+        self.scale = 15.0
+        self.min_scale = 1.0
+        self.max_scale = 30.0
+        self.zoom_factor = 1.25
+        self.width = 1200.0
+        self.height = 750.0
+
+        # Screen-space sizes in pixels that select the level of detail.
+        self.point_size = 2.0
+        self.simple_size = 8.0
+
+    def resize(self, width, height):
+        self.width = float(width)
+        self.height = float(height)
+
+    def zoom_in(self):
+        self.zoom(self.zoom_factor)
+
+    def zoom_out(self):
+        self.zoom(1.0 / self.zoom_factor)
+
+    def zoom(self, factor):
+        self.scale = max(self.min_scale,
+                         min(self.scale * factor, self.max_scale))
+
+    def get_half_extents(self):
+        return self.width / self.scale / 2.0, self.height / self.scale / 2.0
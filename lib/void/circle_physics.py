@@ -0,0 +1,366 @@
+# Copyright (c) 2008 Mikael Lind
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+import math
+import numpy
+import void.box2d as box2d
+from void.physics import Physics
+
+class CircleBody(object):
+    def __init__(self, physics, index, body_id, agent):
+        self.physics = physics
+        self.index = index
+        self.id = body_id
+        self.agent = agent
+
+    def GetPosition(self):
+        x, y = self.physics.positions[self.index]
+        return box2d.b2Vec2(x, y)
+
+    def GetAngle(self):
+        return float(self.physics.angles[self.index])
+
+    def GetLinearVelocity(self):
+        x, y = self.physics.linear_velocities[self.index]
+        return box2d.b2Vec2(x, y)
+
+    def SetLinearVelocity(self, linear_velocity):
+        self.physics.linear_velocities[self.index] = (linear_velocity.x,
+                                                      linear_velocity.y)
+
+    def GetAngularVelocity(self):
+        return float(self.physics.angular_velocities[self.index])
+
+    def SetAngularVelocity(self, angular_velocity):
+        self.physics.angular_velocities[self.index] = angular_velocity
+
+    def ApplyForce(self, force, point):
+        self.physics.forces[self.index] += (force.x, force.y)
+
+    def SetXForm(self, position, angle):
+        self.physics.positions[self.index] = (position.x, position.y)
+        self.physics.angles[self.index] = angle
+
+    def GetUserData(self):
+        return self.agent
+
+class CircleJoint(object):
+    def __init__(self, body_1, body_2, length):
+        self.body_1 = body_1
+        self.body_2 = body_2
+        self.length = length
+
+class CirclePhysics(Physics):
+    # Models every body as a circle and keeps body state in NumPy arrays, so
+    # that integration, broadphase and collision response run vectorized.
+    # Polygons get their bounding circle and the mass of the polygon.
+
+    array_names = ["positions", "angles", "linear_velocities",
+                   "angular_velocities", "forces", "radii", "inverse_masses",
+                   "restitutions", "category_bits", "mask_bits", "sensors",
+                   "ids"]
+
+    def __init__(self, listener, capacity=256):
+        super(CirclePhysics, self).__init__(listener)
+        self.count = 0
+        self.next_id = 0
+        self.bodies = []
+        self.bodies_by_id = {}
+        self.joints = []
+        self.contacts = numpy.zeros(0, dtype=numpy.int64)
+        self.joint_bias = 0.2
+        self.correction_factor = 0.8
+        self.linear_slop = 0.005
+        self.positions = numpy.zeros((capacity, 2))
+        self.angles = numpy.zeros(capacity)
+        self.linear_velocities = numpy.zeros((capacity, 2))
+        self.angular_velocities = numpy.zeros(capacity)
+        self.forces = numpy.zeros((capacity, 2))
+        self.radii = numpy.zeros(capacity)
+        self.inverse_masses = numpy.zeros(capacity)
+        self.restitutions = numpy.zeros(capacity)
+        self.category_bits = numpy.zeros(capacity, dtype=numpy.int32)
+        self.mask_bits = numpy.zeros(capacity, dtype=numpy.int32)
+        self.sensors = numpy.zeros(capacity, dtype=bool)
+        self.ids = numpy.zeros(capacity, dtype=numpy.int64)
+
+    def grow(self):
+        for name in self.array_names:
+            array = getattr(self, name)
+            shape = (2 * len(array),) + array.shape[1:]
+            new_array = numpy.zeros(shape, dtype=array.dtype)
+            new_array[:self.count] = array[:self.count]
+            setattr(self, name, new_array)
+
+    def create_polygon_body(self, agent, position, angle, vertices, density,
+                            restitution, category_bits, mask_bits):
+        radius = max(math.sqrt(x ** 2 + y ** 2) for x, y in vertices)
+        area = 0.0
+        for i in xrange(len(vertices)):
+            x_1, y_1 = vertices[i - 1]
+            x_2, y_2 = vertices[i]
+            area += 0.5 * (x_1 * y_2 - x_2 * y_1)
+        mass = density * abs(area)
+        return self.create_body(agent, position, angle, radius, mass,
+                                restitution, category_bits, mask_bits, False)
+
+    def create_circle_body(self, agent, position, radius, category_bits,
+                           mask_bits, sensor=False):
+        return self.create_body(agent, position, 0.0, radius, 0.0, 0.0,
+                                category_bits, mask_bits, sensor)
+
+    def create_body(self, agent, position, angle, radius, mass, restitution,
+                    category_bits, mask_bits, sensor):
+        if self.count == len(self.ids):
+            self.grow()
+        i = self.count
+        self.positions[i] = (position.x, position.y)
+        self.angles[i] = angle
+        self.linear_velocities[i] = (0.0, 0.0)
+        self.angular_velocities[i] = 0.0
+        self.forces[i] = (0.0, 0.0)
+        self.radii[i] = radius
+        self.inverse_masses[i] = mass > 0.0 and 1.0 / mass or 0.0
+        self.restitutions[i] = restitution
+        self.category_bits[i] = category_bits
+        self.mask_bits[i] = mask_bits
+        self.sensors[i] = sensor
+        self.ids[i] = self.next_id
+        body = CircleBody(self, i, self.next_id, agent)
+        self.bodies.append(body)
+        self.bodies_by_id[body.id] = body
+        self.next_id += 1
+        self.count += 1
+        return body
+
+    def destroy_body(self, body):
+        self.joints = [joint for joint in self.joints
+                       if body not in (joint.body_1, joint.body_2)]
+
+        # Move the last body into the freed slot.
+        i = body.index
+        last = self.count - 1
+        if i != last:
+            for name in self.array_names:
+                array = getattr(self, name)
+                array[i] = array[last]
+            moved = self.bodies[last]
+            moved.index = i
+            self.bodies[i] = moved
+        self.bodies.pop()
+        del self.bodies_by_id[body.id]
+        self.count -= 1
+        body.index = None
+
+    def get_agents(self):
+        bodies = sorted(self.bodies, key=lambda body: body.id)
+        return [body.agent for body in bodies]
+
+    def step(self, dt):
+        n = self.count
+        if n == 0:
+            return
+        inverse_masses = self.inverse_masses[:n, numpy.newaxis]
+        self.linear_velocities[:n] += self.forces[:n] * inverse_masses * dt
+        self.forces[:n] = 0.0
+        self.solve_joints(dt)
+        self.positions[:n] += self.linear_velocities[:n] * dt
+        self.angles[:n] += self.angular_velocities[:n] * dt
+        first, second = self.find_pairs()
+        self.report_contacts(first, second)
+        self.resolve_collisions(first, second)
+
+    def solve_joints(self, dt):
+        positions = self.positions
+        linear_velocities = self.linear_velocities
+        for joint in self.joints:
+            i = joint.body_1.index
+            j = joint.body_2.index
+            inverse_mass_1 = self.inverse_masses[i]
+            inverse_mass_2 = self.inverse_masses[j]
+            inverse_mass = inverse_mass_1 + inverse_mass_2
+            offset = positions[j] - positions[i]
+            distance = math.sqrt(offset[0] ** 2 + offset[1] ** 2)
+            if inverse_mass <= 0.0 or distance <= 0.0:
+                continue
+            normal = offset / distance
+            speed = numpy.dot(linear_velocities[j] - linear_velocities[i],
+                              normal)
+            error = distance - joint.length
+            impulse = -(speed + self.joint_bias * error / dt) / inverse_mass
+            linear_velocities[i] -= impulse * inverse_mass_1 * normal
+            linear_velocities[j] += impulse * inverse_mass_2 * normal
+
+    def find_pairs(self):
+        # Uniform grid broadphase: sort bodies by cell and look each body's
+        # cell and half of its neighbours up with binary search. Searching
+        # in sorted order keeps the lookups cache friendly.
+        n = self.count
+        positions = self.positions[:n]
+        radii = self.radii[:n]
+        cell_size = 2.0 * radii.max()
+        empty = numpy.zeros(0, dtype=numpy.intp)
+        if cell_size <= 0.0:
+            return empty, empty
+        cells = numpy.floor(positions / cell_size).astype(numpy.int64)
+        cells += 1 << 20
+        keys = (cells[:, 0] << 21) + cells[:, 1]
+        order = numpy.argsort(keys, kind="mergesort")
+        sorted_keys = keys[order]
+        firsts = []
+        seconds = []
+        for dx, dy in ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1)):
+            neighbor_keys = sorted_keys + ((dx << 21) + dy)
+            starts = numpy.searchsorted(sorted_keys, neighbor_keys, "left")
+            ends = numpy.searchsorted(sorted_keys, neighbor_keys, "right")
+            counts = ends - starts
+            total = counts.sum()
+            if not total:
+                continue
+            first = numpy.repeat(order, counts)
+            offsets = (numpy.arange(total) -
+                       numpy.repeat(numpy.cumsum(counts) - counts, counts))
+            second = order[numpy.repeat(starts, counts) + offsets]
+            if dx == 0 and dy == 0:
+                keep = first < second
+                first = first[keep]
+                second = second[keep]
+            firsts.append(first)
+            seconds.append(second)
+        if not firsts:
+            return empty, empty
+        first = numpy.concatenate(firsts)
+        second = numpy.concatenate(seconds)
+
+        category_bits = self.category_bits[:n]
+        mask_bits = self.mask_bits[:n]
+        keep = (((category_bits[first] & mask_bits[second]) != 0) &
+                ((category_bits[second] & mask_bits[first]) != 0))
+        first = first[keep]
+        second = second[keep]
+        offsets = positions[second] - positions[first]
+        reach = radii[first] + radii[second]
+        keep = (offsets ** 2).sum(axis=1) < reach ** 2
+        return first[keep], second[keep]
+
+    def report_contacts(self, first, second):
+        ids_1 = self.ids[first]
+        ids_2 = self.ids[second]
+        keys = ((numpy.minimum(ids_1, ids_2) << 32) +
+                numpy.maximum(ids_1, ids_2))
+        keys = numpy.unique(keys)
+        added = numpy.setdiff1d(keys, self.contacts, assume_unique=True)
+        self.contacts = keys
+        for key in added:
+            body_1 = self.bodies_by_id[int(key >> 32)]
+            body_2 = self.bodies_by_id[int(key & 0xffffffff)]
+            self.listener.add_contact(body_1.agent, body_2.agent)
+
+    def resolve_collisions(self, first, second):
+        n = self.count
+        solid = ~(self.sensors[first] | self.sensors[second])
+        first = first[solid]
+        second = second[solid]
+        inverse_masses_1 = self.inverse_masses[first]
+        inverse_masses_2 = self.inverse_masses[second]
+        inverse_masses = inverse_masses_1 + inverse_masses_2
+        keep = inverse_masses > 0.0
+        if not keep.any():
+            return
+        first = first[keep]
+        second = second[keep]
+        inverse_masses_1 = inverse_masses_1[keep, numpy.newaxis]
+        inverse_masses_2 = inverse_masses_2[keep, numpy.newaxis]
+        inverse_masses = inverse_masses[keep]
+
+        positions = self.positions[:n]
+        linear_velocities = self.linear_velocities[:n]
+        offsets = positions[second] - positions[first]
+        distances = numpy.sqrt((offsets ** 2).sum(axis=1))
+        distances = numpy.maximum(distances, 1e-9)
+        normals = offsets / distances[:, numpy.newaxis]
+
+        # Restitution impulses along the normal for approaching pairs.
+        velocities = linear_velocities[second] - linear_velocities[first]
+        speeds = (velocities * normals).sum(axis=1)
+        restitutions = numpy.maximum(self.restitutions[first],
+                                     self.restitutions[second])
+        impulses = numpy.where(speeds < 0.0,
+                               -(1.0 + restitutions) * speeds / inverse_masses,
+                               0.0)
+        impulses = normals * impulses[:, numpy.newaxis]
+        numpy.add.at(linear_velocities, first, -impulses * inverse_masses_1)
+        numpy.add.at(linear_velocities, second, impulses * inverse_masses_2)
+
+        # Push overlapping bodies apart in proportion to inverse mass.
+        penetrations = self.radii[first] + self.radii[second] - distances
+        corrections = (self.correction_factor *
+                       numpy.maximum(penetrations - self.linear_slop, 0.0) /
+                       inverse_masses)
+        corrections = normals * corrections[:, numpy.newaxis]
+        numpy.add.at(positions, first, -corrections * inverse_masses_1)
+        numpy.add.at(positions, second, corrections * inverse_masses_2)
+
+    def query(self, lower_bound, upper_bound, max_count):
+        n = self.count
+        x = self.positions[:n, 0]
+        y = self.positions[:n, 1]
+        radii = self.radii[:n]
+        inside = ((x + radii >= lower_bound.x) & (x - radii <= upper_bound.x) &
+                  (y + radii >= lower_bound.y) & (y - radii <= upper_bound.y))
+        indices = numpy.flatnonzero(inside)[:max_count]
+        return [self.bodies[i].agent for i in indices]
+
+    def raycast(self, point_1, point_2):
+        # Solve |point_1 + t * direction - center| = radius for the nearest
+        # entry point, skipping circles that contain the start point.
+        n = self.count
+        direction = numpy.array([point_2.x - point_1.x,
+                                 point_2.y - point_1.y])
+        a = numpy.dot(direction, direction)
+        if n == 0 or a <= 0.0:
+            return 1.0, None
+        offsets = self.positions[:n] - (point_1.x, point_1.y)
+        b = numpy.dot(offsets, direction)
+        c = (offsets ** 2).sum(axis=1) - self.radii[:n] ** 2
+        discriminants = b ** 2 - a * c
+        fractions = (b - numpy.sqrt(numpy.maximum(discriminants, 0.0))) / a
+        hits = numpy.flatnonzero((discriminants >= 0.0) & (c > 0.0) &
+                                 (fractions >= 0.0) & (fractions <= 1.0))
+        if not len(hits):
+            return 1.0, None
+        i = hits[numpy.argmin(fractions[hits])]
+        return float(fractions[i]), self.bodies[i].agent
+
+    def create_distance_joint(self, body_1, body_2):
+        offset = body_2.GetPosition() - body_1.GetPosition()
+        length = math.sqrt(offset.x ** 2 + offset.y ** 2)
+        joint = CircleJoint(body_1, body_2, length)
+        self.joints.append(joint)
+        return joint
+
+    def destroy_joint(self, joint):
+        self.joints.remove(joint)
+
+    def get_joint_anchors(self, joint):
+        return joint.body_1.GetPosition(), joint.body_2.GetPosition()
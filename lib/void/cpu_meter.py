@@ -0,0 +1,57 @@
+# Copyright (c) 2008 Mikael Lind
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+import os, time
+
+class CpuMeter(object):
+    def __init__(self):
+        self.state = None
+        self.cpu_times = {}
+        self.wall_times = {}
+        self.cpu_time, self.wall_time = self.get_times()
+
+    def get_times(self):
+        user_time, system_time = os.times()[:2]
+        return user_time + system_time, time.time()
+
+    def update(self):
+        cpu_time, wall_time = self.get_times()
+        if self.state is not None:
+            self.cpu_times[self.state] = (self.cpu_times.get(self.state, 0.0) +
+                                          cpu_time - self.cpu_time)
+            self.wall_times[self.state] = (self.wall_times.get(self.state, 0.0)
+                                           + wall_time - self.wall_time)
+        self.cpu_time = cpu_time
+        self.wall_time = wall_time
+
+    def set_state(self, state):
+        if state != self.state:
+            self.update()
+            self.state = state
+
+    def get_usage(self):
+        # CPU seconds spent per wall-clock second in each state.
+        self.update()
+        return dict((state, self.cpu_times[state] / wall_time)
+                    for state, wall_time in self.wall_times.iteritems()
+                    if wall_time > 0.0)
@@ -0,0 +1,105 @@
+# Copyright (c) 2008 Mikael Lind
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+import struct, time
+
+SPAWN = 1
+SPLIT = 2
+DEATH = 3
+DESTROY_BODY = 4
+CONTACT = 5
+LASER_HIT = 6
+TOWLINE_CREATE = 7
+TOWLINE_DESTROY = 8
+
+event_names = {
+    SPAWN: "spawn",
+    SPLIT: "split",
+    DEATH: "death",
+    DESTROY_BODY: "destroy_body",
+    CONTACT: "contact",
+    LASER_HIT: "laser_hit",
+    TOWLINE_CREATE: "towline_create",
+    TOWLINE_DESTROY: "towline_destroy",
+}
+
+magic = "VOIDTRC1"
+
+# Time, step, event type and the serials of up to two agents.
+header_struct = struct.Struct("<8sQ")
+event_struct = struct.Struct("<dIB3xQQ")
+
+class EventTrace(object):
+    def __init__(self, capacity=65536):
+        self.capacity = capacity
+        self.buffer = bytearray(capacity * event_struct.size)
+        self.count = 0
+        self.step = 0
+
+    def log(self, event_type, agent_1=None, agent_2=None):
+        offset = self.count % self.capacity * event_struct.size
+        event_struct.pack_into(self.buffer, offset, time.time(), self.step,
+                               event_type,
+                               agent_1 is not None and agent_1.serial or 0,
+                               agent_2 is not None and agent_2.serial or 0)
+        self.count += 1
+
+    def dump(self, path):
+        # Write the retained events oldest first.
+        count = min(self.count, self.capacity)
+        start = self.count % self.capacity * event_struct.size
+        f = open(path, "wb")
+        try:
+            f.write(header_struct.pack(magic, count))
+            if self.count > self.capacity:
+                f.write(self.buffer[start:])
+                f.write(self.buffer[:start])
+            else:
+                f.write(self.buffer[:count * event_struct.size])
+        finally:
+            f.close()
+
+class NullTrace(object):
+    # Stands in for EventTrace in games that are not worth tracing, such as
+    # replay seeks and benchmarks.
+
+    def __init__(self):
+        self.step = 0
+
+    def log(self, event_type, agent_1=None, agent_2=None):
+        pass
+
+def read_events(path):
+    f = open(path, "rb")
+    try:
+        data = f.read()
+    finally:
+        f.close()
+    file_magic, count = header_struct.unpack_from(data, 0)
+    if file_magic != magic:
+        raise ValueError("Not an event trace: %s" % path)
+    events = []
+    for i in xrange(count):
+        offset = header_struct.size + i * event_struct.size
+        events.append(event_struct.unpack_from(data, offset))
+    return events
@@ -21,77 +21,243 @@
 # FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
 # OTHER DEALINGS IN THE SOFTWARE.
 
-import sys, random, math, pyglet
+import sys, random, math, time, pyglet
 from pyglet.gl import *
 from void.asteroid import Asteroid
 import void.box2d as box2d
+from void.camera import Camera
+import void.event_trace as event_trace
 from void.hub import Hub
+import void.metrics as metrics
+from void.physics import create_physics
 from void.ship import Ship
-from void.void_contact_listener import VoidContactListener
 
 class Game(object):
-    def __init__(self):
-        self.world = self.create_world()
+    def __init__(self, physics="box2d", trace=None, registry=None):
+        self.physics = physics
+        if trace is None:
+            trace = event_trace.NullTrace()
+        self.trace = trace
+
+        # Games without a registry keep their metrics to themselves.
+        if registry is None:
+            registry = metrics.Registry()
+        self.create_metrics(registry)
+        self.reset()
+        self.camera = Camera()
+        self.step_count = 0
+        self.rate_time = time.time()
+        self.rate_step_count = 0
+
+    def reset(self):
+        # Start over with a new world that holds only the hub and the ship.
+        self.world = create_physics(self.physics, self)
         self.added_contacts = []
-        self.contact_listener = VoidContactListener(self)
-        self.world.SetContactListener(self.contact_listener)
+        self.agent_counts = {}
         self.hub = Hub(self.world)
-        self.ship = Ship(self.world)
+        self.add_agent(self.hub)
+        self.ship = Ship(self.world, self.trace)
+        self.add_agent(self.ship)
+
+    def create_metrics(self, registry):
+        self.step_counter = registry.register(metrics.Counter(
+            "void_steps_total", "Game steps simulated."))
+        self.step_rate_gauge = registry.register(metrics.Gauge(
+            "void_steps_per_second", "Game steps simulated per second."))
+        self.step_histogram = registry.register(metrics.Histogram(
+            "void_step_seconds", "Wall-clock time spent in each game step.",
+            [0.0005, 0.001, 0.002, 0.005, 0.01, 0.0167, 0.025, 0.05, 0.1,
+             0.25]))
+        self.agent_gauge = registry.register(metrics.Gauge(
+            "void_agents", "Live agents by type.", "type"))
+        self.contact_histogram = registry.register(metrics.Histogram(
+            "void_contacts_per_step", "Contacts added in each game step.",
+            [0, 1, 2, 5, 10, 20, 50, 100]))
+        self.laser_hit_counter = registry.register(metrics.Counter(
+            "void_laser_hits_total", "Laser ray casts that hit an asteroid."))
+        self.split_counter = registry.register(metrics.Counter(
+            "void_asteroid_splits_total", "Asteroids split in two."))
+        self.destruction_counter = registry.register(metrics.Counter(
+            "void_destructions_total", "Agents destroyed, by type.", "type"))
+        self.game_over_counter = registry.register(metrics.Counter(
+            "void_game_over_total", "Games ended, by cause.", "cause"))
+
+    def add_agent(self, agent):
+        name = type(agent).__name__
+        self.agent_counts[name] = self.agent_counts.get(name, 0) + 1
+
+    def remove_agent(self, agent):
+        name = type(agent).__name__
+        self.agent_counts[name] -= 1
+        self.destruction_counter.inc(1, name)
 
     def step(self, dt):
+        start_time = time.time()
+        self.step_count += 1
+        self.trace.step = self.step_count
         maybe_dead = set()
         if random.random() <= dt:
-            Asteroid(self.world, self.ship)
+            agent = Asteroid(self.world, self.ship)
+            self.add_agent(agent)
+            self.trace.log(event_trace.SPAWN, agent)
+        game_over = self.ship.game_over
         self.ship.step(dt)
+        if self.ship.game_over is not None:
+            if game_over is None:
+                self.game_over_counter.inc(1, self.ship.game_over)
+            self.update_metrics(start_time)
+            return
         self.step_laser(dt, maybe_dead)
-        self.world.Step(dt, 10, 8)
+        self.world.step(dt)
         for agent_1, agent_2 in self.added_contacts:
             maybe_dead.add(agent_1)
             maybe_dead.add(agent_2)
             agent_1.collide(agent_2)
             agent_2.collide(agent_1)
-        for agent in maybe_dead:
+        for agent in sorted(maybe_dead, key=lambda agent: agent.serial):
             if not agent.alive:
+                self.trace.log(event_trace.DEATH, agent)
                 if type(agent) is Asteroid:
-                    agent.split()
-                self.world.DestroyBody(agent.body)
+                    children = agent.split()
+                    if children:
+                        self.split_counter.inc()
+                        for child in children:
+                            self.add_agent(child)
+                            self.trace.log(event_trace.SPLIT, agent, child)
+                if agent is self.ship.towline_target:
+                    self.ship.release_towline()
+                self.world.destroy_body(agent.body)
+                self.remove_agent(agent)
+                self.trace.log(event_trace.DESTROY_BODY, agent)
+        self.contact_histogram.observe(len(self.added_contacts))
         del self.added_contacts[:]
+        self.update_metrics(start_time)
+
+    def update_metrics(self, start_time):
+        now = time.time()
+        self.step_counter.inc()
+        self.step_histogram.observe(now - start_time)
+        for name, count in self.agent_counts.iteritems():
+            self.agent_gauge.set(count, name)
+        self.rate_step_count += 1
+        if now - self.rate_time >= 1.0:
+            elapsed = now - self.rate_time
+            self.step_rate_gauge.set(self.rate_step_count / elapsed)
+            self.rate_time = now
+            self.rate_step_count = 0
+
+    def get_state(self):
+        asteroids = [agent for agent in self.world.get_agents()
+                     if type(agent) is Asteroid]
+        if self.ship.towline_target is None:
+            towline = None
+        else:
+            towline = asteroids.index(self.ship.towline_target)
+        return {
+            "step_count": self.step_count,
+            "random_state": random.getstate(),
+            "hub": self.hub.get_state(),
+            "ship": self.ship.get_state(),
+            "asteroids": [agent.get_state() for agent in asteroids],
+            "towline": towline,
+        }
+
+    def set_state(self, state):
+        self.reset()
+        self.step_count = state["step_count"]
+        self.hub.set_state(state["hub"])
+        self.ship.set_state(state["ship"])
+        asteroids = []
+        for agent_state in state["asteroids"]:
+            agent = Asteroid(self.world, None, agent_state["radius"],
+                             box2d.b2Vec2(*agent_state["position"]),
+                             box2d.b2Vec2(*agent_state["linear_velocity"]),
+                             agent_state["vertices"])
+            agent.set_state(agent_state)
+            self.add_agent(agent)
+            asteroids.append(agent)
+        if state["towline"] is not None:
+            self.ship.create_towline(asteroids[state["towline"]])
+        random.setstate(state["random_state"])
 
     def step_laser(self, dt, maybe_dead):
         if self.ship.firing:
             angle = self.ship.body.GetAngle()
             unit = box2d.b2Vec2(-math.sin(angle), math.cos(angle))
-            segment = box2d.b2Segment()
-            segment.p1 = self.ship.body.GetPosition()
-            segment.p2 = segment.p1 + unit * 10.0
-            fraction, normal, shape = self.world.RaycastOne(segment, False,
-                                                            None)
-            if shape is not None:
-                agent = shape.GetBody().GetUserData()
-                if type(agent) is Asteroid:
-                    maybe_dead.add(agent)
-                    agent.power -= self.ship.damage * dt * fraction
+            position = self.ship.body.GetPosition()
+            fraction, agent = self.world.raycast(position,
+                                                 position + unit * 10.0)
+            if type(agent) is Asteroid:
+                self.laser_hit_counter.inc()
+                self.trace.log(event_trace.LASER_HIT, agent)
+                maybe_dead.add(agent)
+                agent.power -= self.ship.damage * dt * fraction
         
     def on_draw(self):
-        glScaled(15.0, 15.0, 15.0)
+        scale = self.camera.scale
+        glScaled(scale, scale, scale)
         position = self.ship.body.GetPosition()
         glTranslated(-position.x, -position.y, 0.0)
         self.draw_lifeline()
         self.draw_towline()
         self.draw_laser()
+
+        # Pick a level of detail from the projected size of each asteroid.
+        points = []
+        shapes = []
         for agent in self.query_draw():
-            agent.draw()
+            if type(agent) is Asteroid:
+                size = agent.radius * scale
+                if size < self.camera.point_size:
+                    points.append(agent)
+                    continue
+                if size < self.camera.simple_size:
+                    shapes.append(agent)
+                    continue
+            agent.draw(scale)
+        self.draw_points(points)
+        self.draw_simple_shapes(shapes)
 
     def query_draw(self):
         position = self.ship.body.GetPosition()
-        aabb = box2d.b2AABB()
-        aabb.lowerBound.Set(position.x - 40.0, position.y - 25.0)
-        aabb.upperBound.Set(position.x + 40.0, position.y + 25.0)
-        max_count = 100
-        (count, shapes) = self.world.Query(aabb, max_count)
-        agents = set(shape.GetBody().GetUserData() for shape in shapes)
+        half_width, half_height = self.camera.get_half_extents()
+        margin = 6.0
+        offset = box2d.b2Vec2(half_width + margin, half_height + margin)
+
+        # Leave room for every live agent so that full-map views are not cut.
+        max_count = sum(self.agent_counts.itervalues())
+        agents = self.world.query(position - offset, position + offset,
+                                  max_count)
         agents = sorted(agents, key=id)
         return agents
+
+    def draw_points(self, agents):
+        # Submit all points in a single draw call.
+        if agents:
+            vertices = []
+            colors = []
+            for agent in agents:
+                position = agent.body.GetPosition()
+                vertices.extend((position.x, position.y))
+                colors.extend(agent.color)
+            pyglet.graphics.draw(len(agents), GL_POINTS, ("v2f", vertices),
+                                 ("c3f", colors))
+
+    def draw_simple_shapes(self, agents):
+        # Submit all quads in a single draw call.
+        if agents:
+            vertices = []
+            colors = []
+            for agent in agents:
+                position = agent.body.GetPosition()
+                x = position.x
+                y = position.y
+                radius = agent.radius
+                vertices.extend((x + radius, y, x, y + radius,
+                                 x - radius, y, x, y - radius))
+                colors.extend(agent.color * 4)
+            pyglet.graphics.draw(4 * len(agents), GL_QUADS,
+                                 ("v2f", vertices), ("c3f", colors))
     
     def draw_lifeline(self):
         position = self.ship.body.GetPosition()
@@ -111,11 +277,9 @@ class Game(object):
         glEnd()
 
     def draw_towline(self):
-        joint_edge = self.ship.body.GetJointList()
-        if joint_edge is not None:
-            joint = joint_edge.joint
-            anchor_1 = joint.GetAnchor1()
-            anchor_2 = joint.GetAnchor2()
+        if self.ship.towline is not None:
+            joint = self.ship.towline
+            anchor_1, anchor_2 = self.world.get_joint_anchors(joint)
             glBegin(GL_LINES)
             glColor3d(1.0, 0.0, 1.0)
             glVertex2d(anchor_1.x, anchor_1.y)
@@ -135,23 +299,6 @@ class Game(object):
             glVertex2d(endpoint.x, endpoint.y)
             glEnd()
 
-    def create_world(self):
-        world_aabb = box2d.b2AABB()
-        world_aabb.lowerBound.Set(-400.0, -400.0)
-        world_aabb.upperBound.Set(400.0, 400.0)
-        gravity = box2d.b2Vec2(0.0, 0.0)
-        return box2d.b2World(world_aabb, gravity, False)
-
-    def add_contact(self, point):
-        agent_1 = point.shape1.GetBody().GetUserData()
-        agent_2 = point.shape2.GetBody().GetUserData()
+    def add_contact(self, agent_1, agent_2):
         self.added_contacts.append((agent_1, agent_2))
-
-    def persist_contact(self, point):
-        pass
-
-    def remove_contact(self, point):
-        pass
-
-    def contact_result(self, point):
-        pass
+        self.trace.log(event_trace.CONTACT, agent_1, agent_2)
@@ -21,32 +21,66 @@
 # FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
 # OTHER DEALINGS IN THE SOFTWARE.
 
-import sys, pyglet
+import time, pyglet
 from pyglet.gl import *
+import void.event_trace as event_trace
 from void.game import Game
+from void.replay import Recorder
+from void.ship import game_over_messages
 
 class GameScreen(object):
     def __init__(self, window):
         self.window = window
+        self.animating = True
+        self.pause_when_inactive = True
+        self.dirty = True
         self.time = 0.0
         self.time_step = 1.0 / 60.0
-        self.game = Game()
+        self.game = Game(trace=event_trace.EventTrace())
+        self.recorder = Recorder(self.game, self.time_step)
+        self.slow_step_time = 2.0 * self.time_step
+        self.trace_interval = 10.0
+        self.last_trace_time = None
+        self.trace_count = 0
 
     def step(self, dt):
         # Use fixed time step.
         self.time += dt
         while self.time >= self.time_step:
             self.time -= self.time_step
-            self.game.step(self.time_step)
+            start_time = time.time()
+            self.recorder.step()
+            game_over = self.game.ship.game_over
+            if game_over is not None:
+                print "Game Over: %s" % game_over_messages[game_over]
+                self.recorder.replay.save()
+                self.window.on_close()
+                return
+            if time.time() - start_time > self.slow_step_time:
+                self.dump_trace(start_time)
+
+    def dump_trace(self, now=None):
+        # Rate-limit automatic dumps so a run of slow steps writes one file.
+        if now is not None and self.last_trace_time is not None:
+            if now - self.last_trace_time < self.trace_interval:
+                return
+        self.last_trace_time = time.time()
+        self.trace_count += 1
+        path = "%s-%d-%d.trace" % (time.strftime("void-%Y%m%d-%H%M%S"),
+                                   self.game.step_count, self.trace_count)
+        self.game.trace.dump(path)
+        print "Event trace written to %s" % path
 
     def on_draw(self):
         glPushMatrix()
         glTranslated(self.window.width / 2.0, self.window.height / 2.0, 0.0)
+        self.game.camera.resize(self.window.width, self.window.height)
         self.game.on_draw()
         glPopMatrix()
 
     def on_key_press(self, symbol, modifiers):
         if symbol == pyglet.window.key.ESCAPE:
+            self.recorder.replay.save()
             self.window.pop_screen()
         if symbol == pyglet.window.key.UP:
             self.game.ship.thrust = 1.0
@@ -59,7 +93,13 @@ class GameScreen(object):
         if symbol == pyglet.window.key.RIGHT:
             self.game.ship.turn = -1.0
         if symbol == pyglet.window.key.ENTER:
-            self.game.ship.toggle_towline()
+            self.recorder.toggle_towline()
+        if symbol == pyglet.window.key.PAGEUP:
+            self.game.camera.zoom_in()
+        if symbol == pyglet.window.key.PAGEDOWN:
+            self.game.camera.zoom_out()
+        if symbol == pyglet.window.key.F12:
+            self.dump_trace()
 
     def on_key_release(self, symbol, modifiers):
         if symbol == pyglet.window.key.UP:
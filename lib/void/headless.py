@@ -0,0 +1,82 @@
+# Copyright (c) 2008 Mikael Lind
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+import sys, time
+from optparse import OptionParser
+import pyglet
+
+# Run headless: no window, so no shadow context either.
+pyglet.options["shadow_window"] = False
+
+from void.game import Game
+import void.metrics as metrics
+from void.metrics_server import start_metrics_server
+from void.ship import game_over_messages
+
+def main(args=None):
+    parser = OptionParser(usage="%prog [options]")
+    parser.add_option("--host", default="127.0.0.1",
+                      help="address to serve metrics on")
+    parser.add_option("-p", "--port", type="int", default=0,
+                      help="port to serve metrics on, 0 for any free port")
+    parser.add_option("-s", "--steps", type="int", default=0,
+                      help="number of steps to run, 0 to run until game over")
+    parser.add_option("--physics", default="box2d",
+                      help="physics backend: box2d or circle")
+    parser.add_option("--realtime", action="store_true", default=False,
+                      help="pace steps to 60 Hz instead of running flat out")
+    parser.add_option("--linger", type="float", default=None,
+                      help="seconds to keep serving metrics after the game, "
+                      "by default until interrupted")
+    options, args = parser.parse_args(args)
+
+    registry = metrics.Registry()
+    server = start_metrics_server(registry, options.host, options.port)
+    print "Serving metrics on %s" % server.get_url()
+    sys.stdout.flush()
+
+    game = Game(options.physics, registry=registry)
+    time_step = 1.0 / 60.0
+    next_time = time.time()
+    while not options.steps or game.step_count < options.steps:
+        game.step(time_step)
+        if game.ship.game_over is not None:
+            print "Game Over: %s" % game_over_messages[game.ship.game_over]
+            break
+        if options.realtime:
+            next_time += time_step
+            time.sleep(max(0.0, next_time - time.time()))
+
+    # Keep serving so that the final numbers, including the game-over
+    # cause, get scraped.
+    try:
+        if options.linger is None:
+            while True:
+                time.sleep(1.0)
+        else:
+            time.sleep(options.linger)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
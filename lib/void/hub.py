@@ -32,39 +32,40 @@ class Hub(Agent):
         super(Hub, self).__init__(world)
         self.color = (1.0, 1.0, 1.0)
         self.radius = 5.0
-        self.vertices = []
-        vertex_count = 90
-        for i in xrange(vertex_count):
-            angle = i * 2.0 * math.pi / vertex_count
-            vertex = self.radius * box2d.b2Vec2(-math.sin(angle),
-                                                math.cos(angle))
-            self.vertices.append(vertex)
+        self.min_vertex_count = 8
+        self.max_vertex_count = 90
+        self.segment_length = 5.0
+        self.vertex_lists = {}
         self.body = self.create_body(world)
 
     def create_body(self, world):
-        body_def = box2d.b2BodyDef()
-        body_def.position.Set(0.0, 0.0)
+        position = box2d.b2Vec2(0.0, 0.0)
+        return world.create_circle_body(self, position, self.radius, 0x0001,
+                                        0x0002, sensor=True)
 
-        shape_def = box2d.b2CircleDef()
-        shape_def.radius = self.radius
-        # shape_def.restitution = 1.0
-        shape_def.filter.categoryBits = 0x0001
-        shape_def.filter.maskBits = 0x0002
-        shape_def.isSensor = True
-
-        body = world.CreateBody(body_def)
-        body.CreateShape(shape_def)
-        body.SetMassFromShapes()
-        body.SetUserData(self)
-        return body
-
-    def draw_geometry(self):
+    def draw_geometry(self, scale):
+        # Tessellate according to the projected circumference.
+        circumference = 2.0 * math.pi * self.radius * scale
+        vertex_count = int(circumference / self.segment_length)
+        vertex_count = max(self.min_vertex_count,
+                           min(vertex_count, self.max_vertex_count))
         glBegin(GL_LINE_LOOP)
         glColor3d(*self.color)
-        for vertex in self.vertices:
-            glVertex2d(vertex.x, vertex.y)
+        for x, y in self.get_vertices(vertex_count):
+            glVertex2d(x, y)
         glEnd()
 
+    def get_vertices(self, vertex_count):
+        vertices = self.vertex_lists.get(vertex_count)
+        if vertices is None:
+            vertices = []
+            for i in xrange(vertex_count):
+                angle = i * 2.0 * math.pi / vertex_count
+                vertices.append((-self.radius * math.sin(angle),
+                                 self.radius * math.cos(angle)))
+            self.vertex_lists[vertex_count] = vertices
+        return vertices
+
     def collide(self, other):
         if type(other) is Asteroid:
             other.alive = False
@@ -0,0 +1,111 @@
+# Copyright (c) 2008 Mikael Lind
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+import bisect
+
+def format_value(value):
+    if value != value:
+        return "NaN"
+    if value in (float("inf"), float("-inf")):
+        return value > 0 and "+Inf" or "-Inf"
+    return repr(float(value))
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    pairs = []
+    for name, value in labels:
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n")
+        pairs.append('%s="%s"' % (name, value.replace('"', '\\"')))
+    return "{%s}" % ",".join(pairs)
+
+class Counter(object):
+    kind = "counter"
+
+    def __init__(self, name, help, label_name=None):
+        self.name = name
+        self.help = help
+        self.label_name = label_name
+        self.values = {}
+
+    def inc(self, amount=1.0, label=None):
+        self.values[label] = self.values.get(label, 0.0) + amount
+
+    def collect(self):
+        for label, value in sorted(self.values.items()):
+            if label is None:
+                yield self.name, (), value
+            else:
+                yield self.name, ((self.label_name, label),), value
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value, label=None):
+        self.values[label] = value
+
+class Histogram(object):
+    kind = "histogram"
+
+    def __init__(self, name, help, buckets):
+        self.name = name
+        self.help = help
+        self.buckets = sorted(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def collect(self):
+        counts = list(self.counts)
+        total = 0
+        for bound, count in zip(self.buckets, counts):
+            total += count
+            yield (self.name + "_bucket", (("le", format_value(bound)),),
+                   total)
+        total += counts[-1]
+        yield self.name + "_bucket", (("le", "+Inf"),), total
+        yield self.name + "_sum", (), self.sum
+        yield self.name + "_count", (), total
+
+class Registry(object):
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        # Prometheus text exposition format, version 0.0.4.
+        lines = []
+        for metric in self.metrics:
+            lines.append("# HELP %s %s" % (metric.name, metric.help))
+            lines.append("# TYPE %s %s" % (metric.name, metric.kind))
+            for name, labels, value in metric.collect():
+                lines.append("%s%s %s" % (name, format_labels(labels),
+                                          format_value(value)))
+        lines.append("")
+        return "\n".join(lines)
@@ -0,0 +1,73 @@
+# Copyright (c) 2008 Mikael Lind
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+class Physics(object):
+    # The operations that the game and its agents need from a physics
+    # engine. Vectors are box2d.b2Vec2 instances. Bodies answer the Box2D
+    # body calls made by the agents: GetPosition, GetAngle,
+    # GetLinearVelocity, SetLinearVelocity, GetAngularVelocity,
+    # SetAngularVelocity, ApplyForce, SetXForm and GetUserData.
+
+    def __init__(self, listener):
+        self.listener = listener
+
+    def create_polygon_body(self, agent, position, angle, vertices, density,
+                            restitution, category_bits, mask_bits):
+        raise NotImplementedError()
+
+    def create_circle_body(self, agent, position, radius, category_bits,
+                           mask_bits, sensor=False):
+        raise NotImplementedError()
+
+    def destroy_body(self, body):
+        raise NotImplementedError()
+
+    def get_agents(self):
+        raise NotImplementedError()
+
+    def step(self, dt):
+        raise NotImplementedError()
+
+    def query(self, lower_bound, upper_bound, max_count):
+        raise NotImplementedError()
+
+    def raycast(self, point_1, point_2):
+        raise NotImplementedError()
+
+    def create_distance_joint(self, body_1, body_2):
+        raise NotImplementedError()
+
+    def destroy_joint(self, joint):
+        raise NotImplementedError()
+
+    def get_joint_anchors(self, joint):
+        raise NotImplementedError()
+
+def create_physics(name, listener):
+    if name == "box2d":
+        from void.box2d_physics import Box2DPhysics
+        return Box2DPhysics(listener)
+    if name == "circle":
+        from void.circle_physics import CirclePhysics
+        return CirclePhysics(listener)
+    raise ValueError("Unknown physics backend: %s" % name)
@@ -0,0 +1,87 @@
+# Copyright (c) 2008 Mikael Lind
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+import random, time
+from optparse import OptionParser
+import pyglet
+
+# Run headless: no window, so no shadow context either.
+pyglet.options["shadow_window"] = False
+
+from void.asteroid import Asteroid
+import void.box2d as box2d
+from void.box2d_physics import max_proxies
+from void.game import Game
+
+def populate(game, count, extent):
+    for i in xrange(count):
+        position = box2d.b2Vec2(random.uniform(-extent, extent),
+                                random.uniform(-extent, extent))
+        Asteroid(game.world, None, None, position)
+
+def measure(physics, count, steps, extent):
+    game = Game(physics)
+    populate(game, count, extent)
+    time_step = 1.0 / 60.0
+    start_time = time.time()
+    for i in xrange(steps):
+        game.step(time_step)
+    return (time.time() - start_time) / steps
+
+def main(args=None):
+    parser = OptionParser(usage="%prog [options]")
+    parser.add_option("-s", "--steps", type="int", default=120,
+                      help="number of steps per measurement")
+    parser.add_option("-e", "--extent", type="float", default=350.0,
+                      help="half size of the square filled with asteroids")
+    parser.add_option("--seed", type="int", default=0)
+    options, args = parser.parse_args(args)
+
+    backends = ["box2d", "circle"]
+
+    # Leave room for the hub, the ship, one spawn per step and the net body
+    # gain of one split per step, so Box2D never exhausts its proxy pool.
+    headroom = 2 + 2 * options.steps
+
+    # Compare both backends up to the largest count Box2D can hold, then
+    # carry on with the circle backend alone.
+    box2d_count = max_proxies - headroom
+    counts = [count for count in (box2d_count // 4, box2d_count // 2,
+                                  box2d_count)
+              if count > 0]
+    counts.extend([1000, 2000, 5000, 10000])
+    print "Box2D proxy limit: %d" % max_proxies
+    print "%8s" % "bodies" + "".join("%12s" % name for name in backends)
+    for count in counts:
+        columns = []
+        for physics in backends:
+            if physics == "box2d" and count + headroom > max_proxies:
+                columns.append("%12s" % "skipped")
+                continue
+            random.seed(options.seed)
+            step_time = measure(physics, count, options.steps, options.extent)
+            columns.append("%10.2fms" % (step_time * 1000.0))
+        print "%8d" % count + "".join(columns)
+
+if __name__ == '__main__':
+    main()
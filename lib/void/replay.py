@@ -0,0 +1,112 @@
+# Copyright (c) 2008 Mikael Lind
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+import cPickle
+from void.game import Game
+
+default_path = "void.replay"
+
+class Replay(object):
+    def __init__(self, time_step, keyframe_interval=10.0, physics="box2d"):
+        self.time_step = time_step
+        self.physics = physics
+        self.keyframe_steps = max(1, int(round(keyframe_interval / time_step)))
+        self.inputs = []
+        self.keyframes = {}
+
+    def __get_step_count(self):
+        return len(self.inputs)
+
+    step_count = property(__get_step_count)
+
+    def get_keyframe_step(self, step):
+        keyframe_step = step - step % self.keyframe_steps
+        while keyframe_step not in self.keyframes:
+            keyframe_step -= self.keyframe_steps
+        return keyframe_step
+
+    def seek(self, step, game=None):
+        # Continue the given game if it is between the keyframe and the
+        # target step. Restoring at every keyframe, as the recording did,
+        # makes both routes reach the same world.
+        step = max(0, min(step, self.step_count))
+        keyframe_step = self.get_keyframe_step(step)
+        if game is None:
+            game = Game(self.physics)
+            game.set_state(self.keyframes[keyframe_step])
+        elif not keyframe_step <= game.step_count <= step:
+            game.set_state(self.keyframes[keyframe_step])
+        while game.step_count < step and game.ship.game_over is None:
+            self.step(game)
+        return game
+
+    def step(self, game):
+        thrust, turn, firing, towline_toggles = self.inputs[game.step_count]
+        game.ship.thrust = thrust
+        game.ship.turn = turn
+        game.ship.firing = firing
+        for i in xrange(towline_toggles):
+            game.ship.toggle_towline()
+        game.step(self.time_step)
+        keyframe = self.keyframes.get(game.step_count)
+        if keyframe is not None:
+            game.set_state(keyframe)
+
+    def save(self, path=default_path):
+        f = open(path, "wb")
+        try:
+            cPickle.dump(self, f, cPickle.HIGHEST_PROTOCOL)
+        finally:
+            f.close()
+
+def load_replay(path=default_path):
+    f = open(path, "rb")
+    try:
+        return cPickle.load(f)
+    finally:
+        f.close()
+
+class Recorder(object):
+    def __init__(self, game, time_step, keyframe_interval=10.0):
+        self.game = game
+        self.replay = Replay(time_step, keyframe_interval, game.physics)
+        self.replay.keyframes[0] = game.get_state()
+        self.game.set_state(self.replay.keyframes[0])
+        self.towline_toggles = 0
+
+    def toggle_towline(self):
+        self.game.ship.toggle_towline()
+        self.towline_toggles += 1
+
+    def step(self):
+        ship = self.game.ship
+        step_input = ship.thrust, ship.turn, ship.firing, self.towline_toggles
+        self.game.step(self.replay.time_step)
+        self.replay.inputs.append(step_input)
+        self.towline_toggles = 0
+        if self.replay.step_count % self.replay.keyframe_steps == 0:
+            # Carry on from the keyframe so that playback, which can only
+            # restore what a keyframe holds, follows the same path.
+            state = self.game.get_state()
+            self.replay.keyframes[self.replay.step_count] = state
+            self.game.set_state(state)
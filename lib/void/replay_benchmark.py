@@ -0,0 +1,91 @@
+# Copyright (c) 2008 Mikael Lind
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+import random, time, cPickle
+from optparse import OptionParser
+import pyglet
+
+# Run headless: no window, so no shadow context either.
+pyglet.options["shadow_window"] = False
+
+from void.game import Game
+from void.replay import Recorder
+
+def record(seconds, time_step, keyframe_interval, seed):
+    # Draw inputs from a private generator so that they leave the game's
+    # random state, which keyframes capture, alone.
+    input_random = random.Random(seed)
+    random.seed(seed)
+    game = Game()
+    recorder = Recorder(game, time_step, keyframe_interval)
+    for i in xrange(int(seconds / time_step)):
+        # Keep the thrust off so the ship stays within lifeline range.
+        if i % 30 == 0:
+            game.ship.turn = input_random.choice((-1.0, 0.0, 1.0))
+            game.ship.firing = input_random.random() < 0.5
+        recorder.step()
+        if game.ship.game_over is not None:
+            break
+    return recorder.replay
+
+def measure(replay, targets):
+    latencies = []
+    for step in targets:
+        start_time = time.time()
+        replay.seek(step)
+        latencies.append(time.time() - start_time)
+    latencies.sort()
+    return (sum(latencies) / len(latencies),
+            latencies[len(latencies) // 2], latencies[-1])
+
+def main(args=None):
+    parser = OptionParser(usage="%prog [options]")
+    parser.add_option("-s", "--seconds", type="float", default=300.0,
+                      help="length of the recorded session")
+    parser.add_option("-n", "--seeks", type="int", default=20,
+                      help="number of random seeks per spacing")
+    parser.add_option("--seed", type="int", default=0)
+    options, args = parser.parse_args(args)
+
+    time_step = 1.0 / 60.0
+    intervals = [1.0, 5.0, 10.0, 30.0, 60.0]
+    step_count = int(options.seconds / time_step)
+    target_random = random.Random(options.seed)
+    targets = [target_random.randint(0, step_count)
+               for i in xrange(options.seeks)]
+
+    print "%d steps, %d seeks" % (step_count, len(targets))
+    print "%10s %10s %10s %10s %10s" % ("interval", "size", "mean",
+                                        "median", "max")
+    for interval in intervals:
+        # The recording restores at its keyframes, so each spacing needs
+        # its own session rather than a thinned copy of another.
+        replay = record(options.seconds, time_step, interval, options.seed)
+        size = len(cPickle.dumps(replay, cPickle.HIGHEST_PROTOCOL))
+        mean, median, worst = measure(replay, targets)
+        print "%9.0fs %9dK %9.1fms %9.1fms %9.1fms" % (
+            interval, size // 1024, mean * 1000.0, median * 1000.0,
+            worst * 1000.0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+# Copyright (c) 2008 Mikael Lind
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+import pyglet
+from pyglet.gl import *
+
+class ReplayScreen(object):
+    def __init__(self, window, replay):
+        self.window = window
+        self.pause_when_inactive = False
+        self.dirty = True
+        self.replay = replay
+        self.time = 0.0
+        self.playing = True
+        self.scrub_time = 5.0
+        self.game = replay.seek(0)
+        self.time_label = pyglet.text.Label("", font_size=12.0,
+                                            anchor_x="right",
+                                            anchor_y="bottom")
+
+    def __get_animating(self):
+        return self.playing
+
+    animating = property(__get_animating)
+
+    def seek(self, step):
+        self.replay.seek(step, self.game)
+        self.dirty = True
+
+    def scrub(self, seconds):
+        steps = int(round(seconds / self.replay.time_step))
+        self.seek(self.game.step_count + steps)
+
+    def step(self, dt):
+        if not self.playing:
+            return
+        self.time += dt
+        while self.time >= self.replay.time_step:
+            self.time -= self.replay.time_step
+            if (self.game.step_count >= self.replay.step_count or
+                self.game.ship.game_over is not None):
+                self.playing = False
+                self.dirty = True
+                break
+            self.replay.step(self.game)
+
+    def on_draw(self):
+        glPushMatrix()
+        glTranslated(self.window.width / 2.0, self.window.height / 2.0, 0.0)
+        self.game.camera.resize(self.window.width, self.window.height)
+        self.game.on_draw()
+        glPopMatrix()
+        self.draw_timeline()
+
+    def draw_timeline(self):
+        margin = 20.0
+        left = margin
+        right = self.window.width - margin
+        y = margin
+        step_count = max(1, self.replay.step_count)
+
+        glBegin(GL_LINES)
+        glColor4d(1.0, 1.0, 1.0, 0.5)
+        glVertex2d(left, y)
+        glVertex2d(right, y)
+        for keyframe_step in self.replay.keyframes:
+            x = left + (right - left) * keyframe_step / step_count
+            glVertex2d(x, y - 3.0)
+            glVertex2d(x, y + 3.0)
+        glColor4d(1.0, 1.0, 0.0, 1.0)
+        x = left + (right - left) * self.game.step_count / step_count
+        glVertex2d(x, y - 8.0)
+        glVertex2d(x, y + 8.0)
+        glEnd()
+
+        time_step = self.replay.time_step
+        self.time_label.text = "%.1f / %.1f s" % (
+            self.game.step_count * time_step,
+            self.replay.step_count * time_step)
+        self.time_label.x = right
+        self.time_label.y = y + 10.0
+        self.time_label.draw()
+
+    def on_key_press(self, symbol, modifiers):
+        if symbol == pyglet.window.key.ESCAPE:
+            self.window.pop_screen()
+        if symbol == pyglet.window.key.SPACE:
+            self.playing = not self.playing
+            self.dirty = True
+        if symbol == pyglet.window.key.LEFT:
+            self.scrub(-self.scrub_time)
+        if symbol == pyglet.window.key.RIGHT:
+            self.scrub(self.scrub_time)
+        if symbol == pyglet.window.key.HOME:
+            self.seek(0)
+        if symbol == pyglet.window.key.END:
+            self.seek(self.replay.step_count)
+        if symbol == pyglet.window.key.PAGEUP:
+            self.game.camera.zoom_in()
+            self.dirty = True
+        if symbol == pyglet.window.key.PAGEDOWN:
+            self.game.camera.zoom_out()
+            self.dirty = True
+
+    def on_key_release(self, symbol, modifiers):
+        pass
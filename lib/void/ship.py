@@ -21,15 +21,22 @@
 # FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
 # OTHER DEALINGS IN THE SOFTWARE.
 
-import math, random, sys
+import math, random
 from void.agent import Agent
 import void.box2d as box2d
 from void.asteroid import Asteroid
+import void.event_trace as event_trace
+
+game_over_messages = {"out_of_range": "Out of Range"}
 
 class Ship(Agent):
-    def __init__(self, world):
+    def __init__(self, world, trace):
         super(Ship, self).__init__(world)
+        self.trace = trace
+        self.game_over = None
         self.color = (1.0, 1.0, 1.0)
+        self.radius = 2.0
+        self.vertices = [(-1.0, -1.0), (1.0, -1.0), (0.0, 2.0)]
         self.thrust = False
         self.firing = False
         self.turn = 0.0
@@ -38,32 +45,37 @@ class Ship(Agent):
         self.max_towing_range = 15.0
         self.max_lifeline_range = 200.0
         self.damage = 3.0
+        self.towline = None
+        self.towline_target = None
         self.body = self.create_body(world)
 
     def create_body(self, world):
-        body_def = box2d.b2BodyDef()
-        body_def.position.Set(0.0, 0.0)
-        body_def.angle = -0.5 * math.pi
+        position = box2d.b2Vec2(0.0, 0.0)
+        return world.create_polygon_body(self, position, -0.5 * math.pi,
+                                         self.vertices, 1000.0, 1.0, 0x0001,
+                                         0x0002)
 
-        shape_def = box2d.b2PolygonDef()
-        shape_def.setVertices_tuple([(-1.0, -1.0), (1.0, -1.0), (0.0, 2.0)])
-        shape_def.density = 1000.0
-        shape_def.restitution = 1.0
-        shape_def.filter.categoryBits = 0x0001
-        shape_def.filter.maskBits = 0x0002
+    def get_state(self):
+        state = super(Ship, self).get_state()
+        state["thrust"] = self.thrust
+        state["firing"] = self.firing
+        state["turn"] = self.turn
+        state["game_over"] = self.game_over
+        return state
 
-        body = world.CreateBody(body_def)
-        body.CreateShape(shape_def)
-        body.SetMassFromShapes()
-        body.SetUserData(self)
-        return body
+    def set_state(self, state):
+        super(Ship, self).set_state(state)
+        self.thrust = state["thrust"]
+        self.firing = state["firing"]
+        self.turn = state["turn"]
+        self.game_over = state["game_over"]
 
     def step(self, dt):
         position = self.body.GetPosition()
         distance = math.sqrt(position.x ** 2 + position.y ** 2)
         if distance > self.max_lifeline_range:
-            print "Game Over: Out of Range"
-            sys.exit()
+            self.game_over = "out_of_range"
+            return
         angle = self.body.GetAngle()
         unit = box2d.b2Vec2(-math.sin(angle), math.cos(angle))
         force = self.thrust * self.max_thrust * unit
@@ -71,29 +83,31 @@ class Ship(Agent):
         self.body.SetAngularVelocity(self.turn * self.max_angular_velocity)
 
     def toggle_towline(self):
-        joint_edge = self.body.GetJointList()
-        if joint_edge is not None:
-            self.world.DestroyJoint(joint_edge.joint)
+        if self.towline is not None:
+            self.release_towline()
             return
 
         position = self.body.GetPosition()
-        aabb = box2d.b2AABB()
-        aabb.lowerBound.Set(position.x - self.max_towing_range,
-                            position.y - self.max_towing_range)
-        aabb.upperBound.Set(position.x + self.max_towing_range,
-                            position.y + self.max_towing_range)
+        offset = box2d.b2Vec2(self.max_towing_range, self.max_towing_range)
         max_count = 100
-        (count, shapes) = self.world.Query(aabb, max_count)
-        targets = set(shape.GetBody().GetUserData() for shape in shapes)
+        targets = self.world.query(position - offset, position + offset,
+                                   max_count)
         targets = list(target for target in targets if self.can_tow(target))
+        targets.sort(key=lambda target: target.serial)
         if targets:
-            target = random.choice(targets)
-            joint_def = box2d.b2DistanceJointDef()
-            joint_def.Initialize(self.body, target.body,
-                                 self.body.GetPosition(),
-                                 target.body.GetPosition())
-            joint_def.collideConnected = True
-            self.world.CreateJoint(joint_def)
+            self.create_towline(random.choice(targets))
+
+    def create_towline(self, target):
+        self.towline = self.world.create_distance_joint(self.body,
+                                                        target.body)
+        self.towline_target = target
+        self.trace.log(event_trace.TOWLINE_CREATE, self, target)
+
+    def release_towline(self):
+        self.world.destroy_joint(self.towline)
+        self.towline = None
+        self.towline_target = None
+        self.trace.log(event_trace.TOWLINE_DESTROY, self)
 
     def can_tow(self, other):
         if type(other) is not Asteroid:
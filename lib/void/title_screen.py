@@ -21,49 +21,65 @@
 # FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
 # OTHER DEALINGS IN THE SOFTWARE.
 
-import sys, pyglet
-from pyglet.gl import *
+import os, sys, pyglet
 from void.game_screen import GameScreen
+from void.replay import default_path, load_replay
+from void.replay_screen import ReplayScreen
 
 class TitleScreen(object):
     def __init__(self, window):
         self.window = window
+        self.animating = False
+        self.pause_when_inactive = True
+        self.dirty = True
+        self.batch = pyglet.graphics.Batch()
         self.void_label = pyglet.text.Label("Void", font_size=50.0, bold=True,
                                             anchor_x="center",
-                                            anchor_y="center")
+                                            anchor_y="center",
+                                            batch=self.batch)
         self.play_label = pyglet.text.Label("[Enter] Play", font_size=20.0,
                                             anchor_x="center",
-                                            anchor_y="center")
+                                            anchor_y="center",
+                                            batch=self.batch)
+        self.replay_label = pyglet.text.Label("[R] Replay", font_size=20.0,
+                                              anchor_x="center",
+                                              anchor_y="center",
+                                              batch=self.batch)
         self.exit_label = pyglet.text.Label("[Escape] Exit", font_size=20.0,
                                             anchor_x="center",
-                                            anchor_y="center")
+                                            anchor_y="center",
+                                            batch=self.batch)
+        self.layout_size = None
+
+    def layout(self):
+        width = self.window.width
+        height = self.window.height
+        self.void_label.x = width / 2.0
+        self.void_label.y = height * 2.0 / 3.0
+        self.play_label.x = width / 4.0
+        self.play_label.y = height / 3.0
+        self.replay_label.x = width / 2.0
+        self.replay_label.y = height / 3.0
+        self.exit_label.x = width * 3.0 / 4.0
+        self.exit_label.y = height / 3.0
+        self.layout_size = width, height
 
     def step(self, dt):
         pass
 
     def on_draw(self):
-        glPushMatrix()
-        glTranslated(self.window.width / 2.0, self.window.height * 2.0 / 3.0,
-                     0.0)
-        self.void_label.draw()
-        glPopMatrix()
-
-        glPushMatrix()
-        glTranslated(self.window.width / 3.0, self.window.height / 3.0, 0.0)
-        self.play_label.draw()
-        glPopMatrix()
-
-        glPushMatrix()
-        glTranslated(self.window.width * 2.0 / 3.0, self.window.height / 3.0,
-                     0.0)
-        self.exit_label.draw()
-        glPopMatrix()
+        if self.layout_size != (self.window.width, self.window.height):
+            self.layout()
+        self.batch.draw()
 
     def on_key_press(self, symbol, modifiers):
         if symbol == pyglet.window.key.ESCAPE:
             self.window.pop_screen()
         if symbol == pyglet.window.key.ENTER:
             self.window.push_screen(GameScreen(self.window))
+        if symbol == pyglet.window.key.R and os.path.exists(default_path):
+            replay = load_replay(default_path)
+            self.window.push_screen(ReplayScreen(self.window, replay))
 
     def on_key_release(self, symbol, modifiers):
         pass
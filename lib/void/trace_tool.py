@@ -0,0 +1,73 @@
+# Copyright (c) 2008 Mikael Lind
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+import sys
+from optparse import OptionParser
+import void.event_trace as event_trace
+
+def format_agent(agent_id):
+    return "%d" % agent_id
+
+def print_timeline(events):
+    start_time = events[0][0]
+    step = None
+    for event_time, event_step, event_type, agent_1, agent_2 in events:
+        if event_step != step:
+            step = event_step
+            print "step %d (+%.3f s)" % (step, event_time - start_time)
+        name = event_trace.event_names.get(event_type, str(event_type))
+        agents = [format_agent(agent_id) for agent_id in (agent_1, agent_2)
+                  if agent_id]
+        print "    %s %s" % (name, " ".join(agents))
+
+def print_counts(events):
+    counts = {}
+    steps = set()
+    for event_time, event_step, event_type, agent_1, agent_2 in events:
+        counts[event_type] = counts.get(event_type, 0) + 1
+        steps.add(event_step)
+    print "%d events in %d steps (%d-%d)" % (len(events), len(steps),
+                                             min(steps), max(steps))
+    for event_type in sorted(counts):
+        name = event_trace.event_names.get(event_type, str(event_type))
+        count = counts[event_type]
+        print "    %-16s %8d %8.2f/step" % (name, count,
+                                             float(count) / len(steps))
+
+def main(args=None):
+    parser = OptionParser(usage="%prog [options] TRACE")
+    parser.add_option("-c", "--counts", action="store_true", default=False,
+                      help="print event counts only")
+    options, args = parser.parse_args(args)
+    if len(args) != 1:
+        parser.error("expected one trace file")
+    events = event_trace.read_events(args[0])
+    if not events:
+        print "No events"
+        return
+    if not options.counts:
+        print_timeline(events)
+    print_counts(events)
+
+if __name__ == '__main__':
+    main()
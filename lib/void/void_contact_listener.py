@@ -24,18 +24,11 @@
 from void import box2d
 
 class VoidContactListener(box2d.b2ContactListener):
-    def __init__(self, game):
+    def __init__(self, listener):
         super(VoidContactListener, self).__init__() 
-        self.__game = game
+        self.__listener = listener
 
     def Add(self, point):
-        self.__game.add_contact(point)
-
-    def Persist(self, point):
-        self.__game.persist_contact(point)
-
-    def Remove(self, point):
-        self.__game.remove_contact(point)
-
-    def Result(self, point):
-        self.__game.contact_result(point)
+        agent_1 = point.shape1.GetBody().GetUserData()
+        agent_2 = point.shape2.GetBody().GetUserData()
+        self.__listener.add_contact(agent_1, agent_2)
@@ -23,6 +23,7 @@
 
 import pyglet, sys
 from pyglet.gl import *
+from void.cpu_meter import CpuMeter
 from void.title_screen import TitleScreen
 
 class VoidWindow(pyglet.window.Window):
@@ -31,35 +32,113 @@ class VoidWindow(pyglet.window.Window):
         self.set_mouse_visible(False)
         glEnable(GL_BLEND)
         glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        self.active = True
+        self.shown = True
+        self.step_interval = 1.0 / 60.0
+        self.inactive_interval = 1.0 / 10.0
+        self.scheduled_interval = None
+        self.cpu_meter = CpuMeter()
         self.screens = [TitleScreen(self)]
-        pyglet.clock.schedule_interval(self.step, 1.0 / 60.0)
+        self.update_schedule()
 
     def push_screen(self, screen):
         self.screens.append(screen)
+        self.invalidate()
 
     def pop_screen(self):
         self.screens.pop()
         if not self.screens:
             self.on_close()
+        else:
+            self.invalidate()
+
+    def invalidate(self):
+        if self.screens:
+            self.screens[-1].dirty = True
+        self.update_schedule()
+
+    def update_schedule(self):
+        # Step only while the top screen animates. Static screens are
+        # redrawn only when they are dirty, and hidden windows do nothing.
+        interval = None
+        state = None
+        if self.screens:
+            screen = self.screens[-1]
+            if not self.shown:
+                state = "hidden"
+            elif not screen.animating:
+                state = "idle"
+            elif not self.active and screen.pause_when_inactive:
+                state = "paused"
+            elif not self.active:
+                interval = self.inactive_interval
+                state = "throttled"
+            else:
+                interval = self.step_interval
+                state = "animating"
+        if interval != self.scheduled_interval:
+            if self.scheduled_interval is not None:
+                pyglet.clock.unschedule(self.step)
+            if interval is not None:
+                pyglet.clock.schedule_interval(self.step, interval)
+            self.scheduled_interval = interval
+        self.cpu_meter.set_state(state)
+        if self.screens:
+            screen = self.screens[-1]
+            self.invalid = screen.dirty or screen.animating
 
     def step(self, dt):
         if self.screens:
             self.screens[-1].step(dt)
+        self.update_schedule()
         
     def on_draw(self):
         glClearColor(0.0, 0.0, 0.0, 0.0)
         self.clear()
         if self.screens:
-            self.screens[-1].on_draw()
+            screen = self.screens[-1]
+            screen.on_draw()
+            screen.dirty = False
+            self.invalid = screen.animating
 
     def on_close(self):
         pyglet.clock.unschedule(self.step)
+        self.scheduled_interval = None
+        usage = self.cpu_meter.get_usage()
+        if usage:
+            print "CPU time per second: %s" % ", ".join(
+                "%s %.3f" % (state, usage[state]) for state in sorted(usage))
         self.close()
 
+    def on_activate(self):
+        self.active = True
+        self.invalidate()
+
+    def on_deactivate(self):
+        self.active = False
+        self.update_schedule()
+
+    def on_show(self):
+        self.shown = True
+        self.invalidate()
+
+    def on_hide(self):
+        self.shown = False
+        self.update_schedule()
+
+    def on_expose(self):
+        self.invalidate()
+
+    def on_resize(self, width, height):
+        pyglet.window.Window.on_resize(self, width, height)
+        self.invalidate()
+
     def on_key_press(self, symbol, modifiers):
         if self.screens:
             self.screens[-1].on_key_press(symbol, modifiers)
+            self.update_schedule()
 
     def on_key_release(self, symbol, modifiers):
         if self.screens:
             self.screens[-1].on_key_release(symbol, modifiers)
+            self.update_schedule()